@@ -1,7 +1,221 @@
+from django.conf import settings
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html
 
-from .models import Profile, Resume  # Import only your custom models
+from .models import (  # Import only your custom models
+    Country,
+    Governorate,
+    Profile,
+    ProfileCapture,
+    Resume,
+    ResumeFingerprint,
+    SkillAlias,
+)
+from .tasks import reextract_resumes, tag_resume_skills
 
 # Register only your models (DO NOT unregister or re-register User)
-admin.site.register(Profile)
-admin.site.register(Resume)
+admin.site.register(Country)
+admin.site.register(Governorate)
+admin.site.register(SkillAlias)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator for very large changelists.
+
+    Unfiltered PostgreSQL tables report the planner estimate from
+    ``pg_class`` instead of running ``COUNT(*)``. Pages are fetched by
+    walking only the primary-key index to the requested offset and then
+    loading full rows for those keys, so deep pages do not read and discard
+    every preceding row.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if not queryset.query.where and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return row[0]
+        return super().count
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        ids = list(
+            self.object_list.values_list("pk", flat=True)[
+                bottom : bottom + self.per_page
+            ]
+        )
+        rows = {obj.pk: obj for obj in self.object_list.filter(pk__in=ids)}
+        return self._get_page([rows[pk] for pk in ids if pk in rows], number, self)
+
+
+def enqueue_in_batches(task, queryset):
+    batch_size = settings.ADMIN_TASK_BATCH_SIZE
+    ids = queryset.order_by("pk").values_list("pk", flat=True)
+    batch = []
+    total = 0
+    for pk in ids.iterator(chunk_size=batch_size):
+        batch.append(pk)
+        if len(batch) == batch_size:
+            task.delay(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        task.delay(batch)
+        total += len(batch)
+    return total
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_select_related = ["user"]
+    raw_id_fields = ["user"]
+    ordering = ["-pk"]
+    search_fields = ["user__username"]
+    search_help_text = "Exact username."
+
+    def get_search_results(self, request, queryset, search_term):
+        # Case-sensitive equality hits the unique index on username; the
+        # default icontains search would scan the whole table.
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return queryset.filter(user__username=search_term), False
+
+
+@admin.register(Profile)
+class ProfileAdmin(LargeTableAdmin):
+    list_display = ["id", "user", "country", "governorate", "created_at"]
+    raw_id_fields = ["user", "country_ref", "governorate_ref"]
+
+
+@admin.register(Resume)
+class ResumeAdmin(LargeTableAdmin):
+    list_display = ["id", "user", "title", "created_at"]
+    filter_horizontal = ["skills"]
+    readonly_fields = ["extracted_text"]
+    actions = ["reextract_text", "retag_skills"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("extracted_text")
+
+    @admin.action(description="Re-extract text and fingerprints")
+    def reextract_text(self, request, queryset):
+        total = enqueue_in_batches(reextract_resumes, queryset)
+        self.message_user(request, f"Queued text extraction for {total} resumes.")
+
+    @admin.action(description="Re-tag skills from extracted text")
+    def retag_skills(self, request, queryset):
+        total = enqueue_in_batches(tag_resume_skills, queryset)
+        self.message_user(request, f"Queued skill tagging for {total} resumes.")
+
+
+class DuplicateClusterFilter(admin.SimpleListFilter):
+    title = "duplicate status"
+    parameter_name = "duplicates"
+
+    def lookups(self, request, model_admin):
+        return [
+            ("clustered", "In a duplicate cluster"),
+            ("original", "Original with duplicates"),
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value() == "clustered":
+            return queryset.filter(duplicate_of__isnull=False)
+        if self.value() == "original":
+            return queryset.filter(resume__near_duplicates__isnull=False).distinct()
+        return queryset
+
+
+@admin.register(ResumeFingerprint)
+class ResumeFingerprintAdmin(admin.ModelAdmin):
+    list_display = ["resume", "duplicate_of", "similarity", "created_at"]
+    list_filter = [DuplicateClusterFilter]
+    list_select_related = ["resume__user", "duplicate_of__user"]
+    ordering = ["duplicate_of", "resume"]
+    readonly_fields = ["resume", "duplicate_of", "similarity", "created_at"]
+    exclude = ["signature"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("signature")
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ProfileCapture)
+class ProfileCaptureAdmin(admin.ModelAdmin):
+    list_display = [
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "samples",
+        "trigger",
+        "download",
+    ]
+    list_filter = ["trigger", "method"]
+    list_select_related = ["user"]
+    search_fields = ["path"]
+    ordering = ["-created_at"]
+    exclude = ["collapsed"]
+    readonly_fields = [
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "samples",
+        "trigger",
+        "user",
+        "created_at",
+        "download",
+    ]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("collapsed")
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:capture_id>/collapsed/",
+                self.admin_site.admin_view(self.collapsed_view),
+                name="api_profilecapture_collapsed",
+            ),
+            *super().get_urls(),
+        ]
+
+    @admin.display(description="Stacks")
+    def download(self, obj):
+        url = reverse("admin:api_profilecapture_collapsed", args=[obj.pk])
+        return format_html('<a href="{}">collapsed stacks</a>', url)
+
+    def collapsed_view(self, request, capture_id):
+        # Captures record full request paths, which can carry tokens.
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        capture = get_object_or_404(ProfileCapture, pk=capture_id)
+        response = HttpResponse(capture.collapsed, content_type="text/plain")
+        response["Content-Disposition"] = (
+            f'attachment; filename="profile-{capture.pk}.collapsed.txt"'
+        )
+        return response
@@ -0,0 +1,49 @@
+import unicodedata
+from bisect import bisect_left
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.casefold().replace("'", "").split())
+
+
+def word_suffixes(text):
+    """Yield ``text`` and every suffix of it starting at a word boundary."""
+    words = text.split(" ")
+    for index in range(len(words)):
+        yield " ".join(words[index:]), index
+
+
+class PrefixIndex:
+    """Immutable sorted-array index answering ranked prefix queries.
+
+    Entries are ``(key, rank, item_id, item)`` tuples with normalized keys.
+    Matches are ordered by rank (a full name beats a later word, a canonical
+    name beats an alias), then exact before prefix matches, then shorter
+    keys; each item is returned once, through its best-scoring key.
+    """
+
+    def __init__(self, entries):
+        self._entries = sorted(entries, key=lambda entry: entry[0])
+        self._keys = [entry[0] for entry in self._entries]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def search(self, query, limit=10, predicate=None):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        best = {}
+        for position in range(bisect_left(self._keys, prefix), len(self._keys)):
+            key, rank, item_id, item = self._entries[position]
+            if not key.startswith(prefix):
+                break
+            if predicate is not None and not predicate(item):
+                continue
+            score = (rank, key != prefix, len(key), key)
+            if item_id not in best or score < best[item_id][0]:
+                best[item_id] = (score, item)
+        ranked = sorted(best.values(), key=lambda match: match[0])
+        return [item for _, item in ranked[:limit]]
@@ -0,0 +1,145 @@
+import hashlib
+import random
+import re
+import struct
+import zlib
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import ResumeFingerprint, ResumeLSHBucket
+
+NUM_PERMUTATIONS = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_SIGNATURE_FORMAT = f"<{NUM_PERMUTATIONS}I"
+
+# Fixed seed so signatures stay comparable across processes and deploys.
+_rng = random.Random(1729)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def shingles(text):
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))} if tokens else set()
+    return {
+        zlib.crc32(" ".join(tokens[i : i + SHINGLE_SIZE]).encode("utf-8"))
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(text):
+    values = shingles(text)
+    if not values:
+        return None
+    return [
+        min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in values)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def pack_signature(signature):
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def unpack_signature(data):
+    return list(struct.unpack(_SIGNATURE_FORMAT, bytes(data)))
+
+
+def band_buckets(signature):
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(
+            struct.pack(f"<{ROWS_PER_BAND}I", *rows), digest_size=8
+        ).digest()
+        buckets.append((band, int.from_bytes(digest, "little", signed=True)))
+    return buckets
+
+
+def estimate_similarity(first, second):
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_PERMUTATIONS
+
+
+def find_near_duplicates(signature, exclude_resume_id=None):
+    """Return ``(resume_id, similarity)`` pairs above the duplicate threshold.
+
+    Only resumes sharing at least one LSH band bucket are compared, so the
+    lookup cost depends on the number of candidates, not the table size.
+    """
+    threshold = settings.RESUME_DUPLICATE_THRESHOLD
+    bucket_filter = Q()
+    for band, bucket in band_buckets(signature):
+        bucket_filter |= Q(band=band, bucket=bucket)
+
+    candidate_ids = (
+        ResumeLSHBucket.objects.filter(bucket_filter)
+        .exclude(resume_id=exclude_resume_id)
+        .values_list("resume_id", flat=True)
+        .distinct()
+    )
+    matches = []
+    for fingerprint in ResumeFingerprint.objects.filter(
+        resume_id__in=candidate_ids
+    ).only("resume_id", "signature"):
+        similarity = estimate_similarity(
+            signature, unpack_signature(fingerprint.signature)
+        )
+        if similarity >= threshold:
+            matches.append((fingerprint.resume_id, similarity))
+    matches.sort(key=lambda match: (-match[1], match[0]))
+    return matches
+
+
+@transaction.atomic
+def index_resume(resume, text):
+    """Store the MinHash signature and LSH buckets of ``resume``.
+
+    The resume is attached to the oldest near-duplicate already indexed, so
+    every cluster points at the first upload of that CV.
+    """
+    signature = minhash(text)
+    ResumeLSHBucket.objects.filter(resume=resume).delete()
+    if signature is None:
+        ResumeFingerprint.objects.filter(resume=resume).delete()
+        return None
+
+    earlier = [
+        match
+        for match in find_near_duplicates(signature, exclude_resume_id=resume.pk)
+        if match[0] < resume.pk
+    ]
+    duplicate_of, similarity = None, None
+    if earlier:
+        original_id, similarity = min(earlier, key=lambda match: match[0])
+        root_id = (
+            ResumeFingerprint.objects.filter(resume_id=original_id)
+            .values_list("duplicate_of_id", flat=True)
+            .first()
+        )
+        duplicate_of = root_id or original_id
+
+    fingerprint, _ = ResumeFingerprint.objects.update_or_create(
+        resume=resume,
+        defaults={
+            "signature": pack_signature(signature),
+            "duplicate_of_id": duplicate_of,
+            "similarity": similarity,
+        },
+    )
+    ResumeLSHBucket.objects.bulk_create(
+        ResumeLSHBucket(resume=resume, band=band, bucket=bucket)
+        for band, bucket in band_buckets(signature)
+    )
+    return fingerprint
@@ -0,0 +1,84 @@
+import io
+import logging
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _ZipBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that hands out what was written so far.
+
+    ``zipfile`` falls back to data descriptors when it cannot seek, so the
+    archive can be produced front to back and streamed as it is built.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _is_missing(error):
+    """Whether ``error`` means the object is not in storage.
+
+    Local storage raises FileNotFoundError; S3 raises botocore's ClientError
+    carrying a 404, which is matched on its response so botocore is not
+    imported for local-only deployments.
+    """
+    if isinstance(error, FileNotFoundError):
+        return True
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    code = response.get("Error", {}).get("Code")
+    return status == 404 or code in ("404", "NoSuchKey")
+
+
+def stream_zip(entries):
+    """Yield a ZIP archive of ``(arcname, file_field, date_time)`` entries.
+
+    Entries are stored without recompression (PDFs are already compressed)
+    and copied in fixed-size chunks, so memory use does not depend on the
+    number or size of files. Files missing from storage are skipped.
+    """
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for arcname, file_field, date_time in entries:
+            try:
+                # Both storages check the object exists when opening for
+                # reading, so a missing file is caught before any bytes of
+                # its entry are written.
+                source = file_field.storage.open(file_field.name, "rb")
+            except Exception as error:
+                if not _is_missing(error):
+                    raise
+                logger.warning("Skipping missing file %s", file_field.name)
+                continue
+            info = zipfile.ZipInfo(arcname, date_time=date_time.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            with source:
+                info.file_size = source.size
+                with archive.open(info, mode="w") as target:
+                    while chunk := source.read(CHUNK_SIZE):
+                        target.write(chunk)
+                        yield buffer.drain()
+            yield buffer.drain()
+    yield buffer.drain()
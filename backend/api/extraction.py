@@ -0,0 +1,21 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def extract_text(file_field):
+    name = file_field.name.lower()
+    with file_field.open("rb") as handle:
+        if name.endswith(".pdf"):
+            from pypdf import PdfReader
+            from pypdf.errors import PdfReadError
+
+            try:
+                reader = PdfReader(handle)
+                return "\n".join(page.extract_text() or "" for page in reader.pages)
+            except PdfReadError:
+                logger.warning("Could not read PDF %s", file_field.name)
+                return ""
+        if name.endswith(".txt"):
+            return handle.read().decode("utf-8", errors="ignore")
+    return ""
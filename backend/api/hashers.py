@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with cost parameters taken from settings.
+
+    A single lane per hash keeps one password on one hashing-pool thread;
+    throughput comes from the pool size instead. Hashes created with other
+    parameters are upgraded on the next successful login.
+    """
+
+    parallelism = 1
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
@@ -0,0 +1,101 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import (
+    check_password,
+    get_hasher,
+    identify_hasher,
+    make_password,
+)
+from rest_framework.exceptions import Throttled
+
+
+class HashingPoolSaturated(Throttled):
+    default_detail = "The server is busy, please try again shortly."
+
+
+_lock = threading.Lock()
+_executor = None
+_slots = None
+_pid = None
+
+
+def _pool():
+    global _executor, _slots, _pid
+    with _lock:
+        # Threads do not survive fork, so rebuild the pool in each worker.
+        if _executor is None or _pid != os.getpid():
+            workers = settings.PASSWORD_HASHING_WORKERS
+            _executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="password-hashing"
+            )
+            _slots = threading.BoundedSemaphore(
+                workers + settings.PASSWORD_HASHING_MAX_QUEUE
+            )
+            _pid = os.getpid()
+        return _executor, _slots
+
+
+def run_hashing(func, *args):
+    """Run ``func`` on the bounded hashing pool and wait for its result.
+
+    Raises ``HashingPoolSaturated`` (a 429 with Retry-After) instead of
+    queueing once every worker is busy and the wait queue is full.
+    """
+    executor, slots = _pool()
+    if not slots.acquire(blocking=False):
+        raise HashingPoolSaturated(wait=settings.PASSWORD_HASHING_RETRY_AFTER)
+    try:
+        future = executor.submit(func, *args)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future.result()
+
+
+def hash_password(raw_password):
+    return run_hashing(make_password, raw_password)
+
+
+def set_password(user, raw_password):
+    user.password = hash_password(raw_password)
+    user._password = raw_password
+
+
+def password_needs_rehash(encoded):
+    preferred = get_hasher("default")
+    try:
+        current = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return current.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def authenticate(username, password):
+    """Username/password check equivalent to ``ModelBackend`` on the pool.
+
+    Hashes using an outdated hasher or cost parameters are transparently
+    replaced with the preferred hasher after a successful check.
+    """
+    if username is None or password is None:
+        return None
+    UserModel = get_user_model()
+    try:
+        user = UserModel._default_manager.get_by_natural_key(username)
+    except UserModel.DoesNotExist:
+        # Hash anyway so unknown usernames take as long as wrong passwords.
+        hash_password(password)
+        return None
+
+    if not run_hashing(check_password, password, user.password):
+        return None
+    if not user.is_active:
+        return None
+    if password_needs_rehash(user.password):
+        user.password = hash_password(password)
+        user.save(update_fields=["password"])
+    return user
@@ -0,0 +1,204 @@
+import gzip
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.crypto import get_random_string
+from django.utils.http import parse_etags
+from django_redis import get_redis_connection
+
+from .storage import signed_url_window
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional at runtime
+    brotli = None
+
+STATS_KEY = "http_cache:stats"
+VERSION_KEY = "resource_version:{scope}"
+ENTRY_KEY = "http_cache:entry:{etag}"
+
+
+def user_scope(username):
+    return f"user:{username}"
+
+
+# Resources that were never changed read the cache-wide epoch as their
+# version. Version keys are only written by bump_version(), i.e. for rows
+# that actually exist, so requests for unknown resources leave nothing
+# behind. The epoch is regenerated whenever the cache loses it (restart,
+# flush, eviction), so a lost bump never revives an ETag handed out before.
+EPOCH_KEY = "resource_version:epoch"
+
+
+def bump_version(scope):
+    cache.set(VERSION_KEY.format(scope=scope), get_random_string(12), None)
+
+
+def bump_version_on_commit(scope, using=None):
+    """Bump ``scope`` once the current transaction commits.
+
+    Bumping earlier lets a concurrent read pair the new version with the old
+    rows and cache them under an ETag that would then never change.
+    """
+    transaction.on_commit(lambda: bump_version(scope), using=using)
+
+
+def _epoch(found):
+    epoch = found.get(EPOCH_KEY)
+    if epoch is None:
+        epoch = get_random_string(12)
+        if not cache.add(EPOCH_KEY, epoch, None):
+            epoch = cache.get(EPOCH_KEY)
+    return epoch
+
+
+def get_version(scope):
+    return get_versions([scope])[scope]
+
+
+def get_versions(scopes):
+    keys = {VERSION_KEY.format(scope=scope): scope for scope in scopes}
+    if not keys:
+        return {}
+    found = cache.get_many([EPOCH_KEY, *keys])
+    epoch = _epoch(found)
+    return {scope: found.get(key, epoch) for key, scope in keys.items()}
+
+
+def make_etag(request, scope, version):
+    digest = hashlib.sha1(
+        # Bodies embed absolute media URLs, so scheme and host are part of
+        # the key as well as the path.
+        "|".join(
+            [
+                request.build_absolute_uri(request.get_full_path()),
+                scope,
+                version,
+                str(signed_url_window()),
+            ]
+        ).encode("utf-8")
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def accepted_encodings(request):
+    encodings = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = part.partition(";")
+        params = params.strip()
+        try:
+            quality = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            quality = 0.0
+        if name.strip() and quality > 0:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+def negotiate_encoding(request, entry):
+    encodings = accepted_encodings(request)
+    if "br" in encodings and "br" in entry:
+        return "br"
+    if "gzip" in encodings:
+        return "gzip"
+    return "identity"
+
+
+def compress_body(body):
+    entry = {"identity": body, "gzip": gzip.compress(body, compresslevel=6)}
+    if brotli is not None:
+        entry["br"] = brotli.compress(body, quality=5)
+    return entry
+
+
+def record_stats(**counters):
+    pipe = get_redis_connection("default").pipeline(transaction=False)
+    for field, amount in counters.items():
+        pipe.hincrby(STATS_KEY, field, amount)
+    pipe.execute()
+
+
+def read_stats():
+    raw = get_redis_connection("default").hgetall(STATS_KEY)
+    return {key.decode(): int(value) for key, value in raw.items()}
+
+
+def reset_stats():
+    get_redis_connection("default").delete(STATS_KEY)
+
+
+def _finalize(response, request, etag):
+    response["ETag"] = etag
+    patch_vary_headers(response, ["Accept-Encoding", "Authorization"])
+    if request.user.is_authenticated:
+        patch_cache_control(response, no_cache=True, private=True)
+    else:
+        patch_cache_control(response, no_cache=True, public=True)
+    return response
+
+
+def cached_json_response(scope_func):
+    """Serve a read-only APIView method from a versioned, precompressed cache.
+
+    ``scope_func(request, *args, **kwargs)`` names the resource the response
+    depends on. Its version is bumped by model signals, so the ETag changes
+    whenever the underlying rows do and stays stable otherwise. Matching
+    ``If-None-Match`` requests get a 304 without touching the database, and
+    cached bodies are stored pre-compressed with gzip (and brotli when
+    available) so repeated fetches skip both serialization and compression.
+    """
+
+    # DRF is imported here rather than at module level: signals import this
+    # module in every process, including Celery workers that never render.
+    from rest_framework.response import Response
+
+    from .renderers import ORJSONRenderer
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            scope = scope_func(request, *args, **kwargs)
+            etag = make_etag(request, scope, get_version(scope))
+            entry_key = ENTRY_KEY.format(etag=etag)
+
+            if etag in parse_etags(request.headers.get("If-None-Match", "")):
+                size = cache.get(f"{entry_key}:size", 0)
+                record_stats(not_modified=1, bytes_saved=size)
+                return _finalize(HttpResponseNotModified(), request, etag)
+
+            entry = cache.get(entry_key)
+            if entry is None:
+                response = view_method(self, request, *args, **kwargs)
+                if not isinstance(response, Response) or response.status_code != 200:
+                    return response
+                entry = compress_body(ORJSONRenderer().render(response.data))
+                timeout = settings.HTTP_CACHE_TIMEOUT
+                cache.set_many(
+                    {entry_key: entry, f"{entry_key}:size": len(entry["identity"])},
+                    timeout,
+                )
+                hit = False
+            else:
+                hit = True
+
+            encoding = negotiate_encoding(request, entry)
+            body = entry[encoding]
+            record_stats(
+                hits=int(hit),
+                misses=int(not hit),
+                bytes_served=len(body),
+                bytes_saved=len(entry["identity"]) - len(body),
+            )
+            response = HttpResponse(body, content_type="application/json")
+            if encoding != "identity":
+                response["Content-Encoding"] = encoding
+            return _finalize(response, request, etag)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,102 @@
+import logging
+
+from django.db import DatabaseError
+
+from .autocomplete import PrefixIndex, normalize, word_suffixes
+from .models import Country, Governorate
+from .shared_index import SharedIndex
+
+logger = logging.getLogger(__name__)
+
+
+class LocationIndex:
+    def __init__(self, countries, governorates):
+        self.countries = {}
+        self.country_codes = {}
+        self.governorates = {}
+        entries = []
+
+        for country in countries:
+            item = {
+                "type": "country",
+                "id": country.id,
+                "code": country.code,
+                "name": country.name,
+            }
+            names = [country.name, *country.aliases]
+            for name in names:
+                self.countries[normalize(name)] = country.id
+            self.countries[normalize(country.code)] = country.id
+            self.country_codes[country.id] = country.code
+            entries.extend(self._entries(("country", country.id), item, names))
+            entries.append(
+                (normalize(country.code), (0, 1), ("country", country.id), item)
+            )
+
+        for governorate in governorates:
+            item = {
+                "type": "governorate",
+                "id": governorate.id,
+                "name": governorate.name,
+                "country": governorate.country.code,
+            }
+            names = [governorate.name, *governorate.aliases]
+            for name in names:
+                key = (governorate.country_id, normalize(name))
+                self.governorates[key] = governorate.id
+            entries.extend(self._entries(("governorate", governorate.id), item, names))
+
+        self.prefixes = PrefixIndex(entries)
+
+    @staticmethod
+    def _entries(item_id, item, names):
+        for alias_rank, name in enumerate(names):
+            for key, word_rank in word_suffixes(normalize(name)):
+                yield key, (word_rank, min(alias_rank, 1)), item_id, item
+
+    def resolve_country(self, text):
+        return self.countries.get(normalize(text))
+
+    def resolve_governorate(self, country_id, text):
+        if country_id is None:
+            return None
+        return self.governorates.get((country_id, normalize(text)))
+
+    def search(self, query, country=None, limit=10):
+        if not country:
+            return self.prefixes.search(query, limit=limit)
+        code = self.country_codes.get(self.resolve_country(country))
+
+        def in_country(item):
+            return item["type"] == "governorate" and item["country"] == code
+
+        return self.prefixes.search(query, limit=limit, predicate=in_country)
+
+
+def build_location_index():
+    return LocationIndex(
+        Country.objects.all(), Governorate.objects.select_related("country")
+    )
+
+
+_shared = SharedIndex("locations", build_location_index)
+
+
+def get_location_index():
+    return _shared.get()
+
+
+def warm_location_index():
+    from redis.exceptions import RedisError
+
+    try:
+        get_location_index()
+    except (DatabaseError, RedisError):
+        # Tables may not exist yet (first deploy before migrate) or Redis may
+        # still be starting; the index is then built on the first lookup.
+        logger.warning("Location index not warmed: database or Redis not ready.")
+
+
+def invalidate_location_index(using=None):
+    """Rebuild the index in every worker once the current transaction commits."""
+    _shared.bump_on_commit(using)
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from api.locations import build_location_index
+from api.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Map free-text Profile.country/governorate values to location rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-map every profile, not only those without a country_ref.",
+        )
+
+    def handle(self, *args, **options):
+        locations = build_location_index()
+        queryset = Profile.objects.exclude(country="")
+        if not options["all"]:
+            queryset = queryset.filter(country_ref__isnull=True)
+
+        # Free text repeats heavily, so issue one UPDATE per distinct
+        # (country, governorate) pair instead of saving profiles one by one.
+        pairs = queryset.values_list("country", "governorate").distinct()
+        updated = 0
+        unmatched = set()
+        for country, governorate in list(pairs):
+            country_id = locations.resolve_country(country)
+            if country_id is None:
+                unmatched.add(country)
+                continue
+            updated += queryset.filter(country=country, governorate=governorate).update(
+                country_ref_id=country_id,
+                governorate_ref_id=locations.resolve_governorate(
+                    country_id, governorate
+                ),
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} profiles."))
+        if unmatched:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Unmatched countries: " + ", ".join(sorted(unmatched))
+                )
+            )
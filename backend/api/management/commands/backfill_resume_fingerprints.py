@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Resume
+from api.tasks import fingerprint_resume
+
+
+class Command(BaseCommand):
+    help = "Compute MinHash fingerprints for resumes that do not have one yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Fingerprint in this process instead of enqueueing Celery tasks.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute fingerprints for every resume, not just missing ones.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Resume.objects.order_by("pk")
+        if not options["all"]:
+            queryset = queryset.filter(fingerprint__isnull=True)
+
+        # Walk the table by primary key so each batch is a cheap index range
+        # scan. Use --sync for a strictly oldest-first pass over existing data.
+        last_pk = 0
+        total = 0
+        while True:
+            ids = list(
+                queryset.filter(pk__gt=last_pk).values_list("pk", flat=True)[
+                    :batch_size
+                ]
+            )
+            if not ids:
+                break
+            for resume_id in ids:
+                if options["sync"]:
+                    fingerprint_resume(resume_id)
+                else:
+                    fingerprint_resume.delay(resume_id)
+            last_pk = ids[-1]
+            total += len(ids)
+            self.stdout.write(f"Processed {total} resumes...")
+
+        self.stdout.write(self.style.SUCCESS(f"Fingerprinted {total} resumes."))
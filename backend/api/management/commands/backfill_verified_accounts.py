@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from api.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Clear pending verification codes on active accounts so that the "
+        "unverified-account purge never deletes them once deactivated."
+    )
+
+    def handle(self, *args, **options):
+        updated = (
+            CustomUser.objects.filter(is_active=True)
+            .exclude(verification_code_sent_at=None, verification_code=None)
+            .update(verification_code=None, verification_code_sent_at=None)
+        )
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} accounts."))
@@ -0,0 +1,49 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, make_password
+from django.core.management.base import BaseCommand
+
+from api.hashing import run_hashing
+
+
+class Command(BaseCommand):
+    help = "Measure password checks per second, inline and through the hashing pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--checks", type=int, default=50)
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=settings.PASSWORD_HASHING_WORKERS,
+            help="Concurrent request threads submitting to the hashing pool.",
+        )
+
+    def handle(self, *args, **options):
+        checks = options["checks"]
+        clients = options["clients"]
+        cores = os.cpu_count() or 1
+        encoded = make_password("correct horse battery staple")
+
+        def login():
+            return check_password("correct horse battery staple", encoded)
+
+        self.stdout.write(f"Hasher: {get_hasher().algorithm} ({cores} cores)")
+
+        start = time.perf_counter()
+        for _ in range(checks):
+            login()
+        inline = checks / (time.perf_counter() - start)
+        self.stdout.write(f"Inline:  {inline:,.1f} logins/s")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as request_threads:
+            list(request_threads.map(lambda _: run_hashing(login), range(checks)))
+        pooled = checks / (time.perf_counter() - start)
+        self.stdout.write(
+            f"Pooled:  {pooled:,.1f} logins/s "
+            f"({pooled / min(settings.PASSWORD_HASHING_WORKERS, cores):,.1f} per core, "
+            f"{settings.PASSWORD_HASHING_WORKERS} workers, {clients} clients)"
+        )
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Profile, Resume
+from api.renderers import ORJSONRenderer
+from api.serializers import (
+    PROFILE_FIELDS,
+    RESUME_FIELDS,
+    ProfileSerializer,
+    ResumeSerializer,
+    profile_rows,
+    resume_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Compare rows/second of the DRF serializers and the lightweight list path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+
+        resumes = Resume.objects.order_by("pk")[:rows]
+        profiles = Profile.objects.order_by("pk")[:rows]
+        self.compare(
+            "resumes",
+            resumes.count(),
+            lambda: JSONRenderer().render(
+                ResumeSerializer(list(resumes.all()), many=True).data
+            ),
+            lambda: ORJSONRenderer().render(
+                resume_rows(resumes.values(*RESUME_FIELDS))
+            ),
+            repeat,
+        )
+        self.compare(
+            "profiles",
+            profiles.count(),
+            lambda: JSONRenderer().render(
+                ProfileSerializer(list(profiles.all()), many=True).data
+            ),
+            lambda: ORJSONRenderer().render(
+                profile_rows(profiles.values(*PROFILE_FIELDS))
+            ),
+            repeat,
+        )
+
+    def compare(self, label, count, baseline, fast, repeat):
+        if not count:
+            self.stdout.write(f"{label}: no rows to benchmark")
+            return
+        baseline_time = self.measure(baseline, repeat)
+        fast_time = self.measure(fast, repeat)
+        self.stdout.write(
+            f"{label} ({count} rows): "
+            f"serializer {count / baseline_time:,.0f} rows/s, "
+            f"fast path {count / fast_time:,.0f} rows/s "
+            f"(x{baseline_time / fast_time:.1f})"
+        )
+
+    def measure(self, func, repeat):
+        func()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) / repeat
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django_redis import get_redis_connection
+
+from cvfinder.celery import TASK_STATS_KEY, app
+
+
+class Command(BaseCommand):
+    help = "Show live Celery queue depths and per-task wait/runtime statistics."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Queue depths:")
+        with app.connection_for_read() as connection:
+            for queue in settings.CELERY_TASK_QUEUES:
+                # A passive declare reports the depth without creating the
+                # queue; brokers answer "not found" for queues never used.
+                try:
+                    with connection.channel() as channel:
+                        _, depth, consumers = channel.queue_declare(
+                            queue=queue.name, passive=True
+                        )
+                except connection.channel_errors:
+                    depth, consumers = 0, 0
+                self.stdout.write(
+                    f"  {queue.name:<12} {depth:>8} waiting  {consumers} consumers"
+                )
+
+        redis = get_redis_connection("default")
+        keys = sorted(redis.scan_iter(match=TASK_STATS_KEY.format(task="*")))
+        if not keys:
+            return
+        self.stdout.write("Tasks:")
+        prefix = TASK_STATS_KEY.format(task="")
+        for key in keys:
+            stats = {
+                field.decode(): int(value)
+                for field, value in redis.hgetall(key).items()
+            }
+            started = stats.get("started", 0)
+            finished = stats.get("finished", 0)
+            avg_wait = stats.get("wait_ms", 0) / started if started else 0
+            avg_runtime = stats.get("runtime_ms", 0) / finished if finished else 0
+            self.stdout.write(
+                f"  {key.decode()[len(prefix):]}: {started} started, "
+                f"{stats.get('failed', 0)} failed, "
+                f"avg wait {avg_wait:.0f} ms, avg runtime {avg_runtime:.0f} ms"
+            )
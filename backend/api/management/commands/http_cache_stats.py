@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from api.http_cache import read_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = "Report hit ratio and bytes saved by the cached JSON response layer."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Clear the counters after reporting."
+        )
+
+    def handle(self, *args, **options):
+        stats = read_stats()
+        hits = stats.get("hits", 0)
+        not_modified = stats.get("not_modified", 0)
+        misses = stats.get("misses", 0)
+        total = hits + not_modified + misses
+
+        self.stdout.write(f"Requests:       {total}")
+        self.stdout.write(f"Cache hits:     {hits}")
+        self.stdout.write(f"304 responses:  {not_modified}")
+        self.stdout.write(f"Cache misses:   {misses}")
+        if total:
+            ratio = (hits + not_modified) / total
+            self.stdout.write(f"Hit ratio:      {ratio:.1%}")
+        self.stdout.write(f"Bytes served:   {stats.get('bytes_served', 0)}")
+        self.stdout.write(f"Bytes saved:    {stats.get('bytes_saved', 0)}")
+
+        if options["reset"]:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Profile, Resume
+from api.storage import is_remote
+
+
+class Command(BaseCommand):
+    help = "Copy resumes and profile pictures from MEDIA_ROOT to object storage."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        resume_storage = Resume._meta.get_field("file").storage
+        picture_storage = Profile._meta.get_field("profile_picture").storage
+        if not is_remote(resume_storage) or not is_remote(picture_storage):
+            raise CommandError(
+                "No object storage configured; set AWS_STORAGE_BUCKET_NAME first."
+            )
+
+        self.source = FileSystemStorage(location=settings.MEDIA_ROOT)
+        self.dry_run = options["dry_run"]
+        batch_size = options["batch_size"]
+        pictures = Profile.objects.exclude(profile_picture="").exclude(
+            profile_picture__isnull=True
+        )
+        sources = [
+            ("resumes", Resume.objects.values_list("file", flat=True), resume_storage),
+            (
+                "profile pictures",
+                pictures.values_list("profile_picture", flat=True),
+                picture_storage,
+            ),
+        ]
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            for label, names, target in sources:
+                counts = {"copied": 0, "present": 0, "missing": 0}
+                batch = []
+                for name in names.order_by("pk").iterator(chunk_size=batch_size):
+                    batch.append(name)
+                    if len(batch) == batch_size:
+                        self.copy_batch(executor, batch, target, counts)
+                        batch = []
+                self.copy_batch(executor, batch, target, counts)
+                self.stdout.write(
+                    f"{label}: {counts['copied']} copied, "
+                    f"{counts['present']} already present, "
+                    f"{counts['missing']} missing locally"
+                )
+
+    def copy_batch(self, executor, names, target, counts):
+        for result in executor.map(lambda name: self.copy(name, target), names):
+            counts[result] += 1
+
+    def copy(self, name, target):
+        # Keys keep their local names, so no database rows need to change.
+        if not self.source.exists(name):
+            return "missing"
+        if target.exists(name):
+            return "present"
+        if not self.dry_run:
+            with self.source.open(name, "rb") as content:
+                saved = target.save(name, content)
+            if saved != name:
+                raise CommandError(f"Storage renamed {name} to {saved}.")
+        return "copied"
@@ -0,0 +1,88 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_MODULES = ["cvfinder.wsgi", "cvfinder.urls", "api.tasks"]
+
+
+def parse_importtime(output):
+    """Return ``(module, self_us, cumulative_us, depth)`` rows from -X importtime."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # Column header.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Measure cold-start time of a fresh interpreter and report slow imports."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "modules",
+            nargs="*",
+            default=DEFAULT_MODULES,
+            help="Modules imported after django.setup(), as a worker would.",
+        )
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--top", type=int, default=20)
+
+    def run_once(self, modules, importtime=False):
+        code = "import django; django.setup()"
+        if modules:
+            code += "; import " + ", ".join(modules)
+        command = [sys.executable]
+        if importtime:
+            command += ["-X", "importtime"]
+        command += ["-c", code]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        return result.stderr
+
+    def handle(self, *args, **options):
+        modules = options["modules"]
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cvfinder.settings")
+
+        # The first run warms the OS page cache and .pyc files.
+        self.run_once(modules)
+        timings = []
+        for _ in range(options["runs"]):
+            start = time.perf_counter()
+            self.run_once(modules)
+            timings.append((time.perf_counter() - start) * 1000)
+        rows = parse_importtime(self.run_once(modules, importtime=True))
+
+        self.stdout.write(
+            f"Cold start of django.setup() + {', '.join(modules) or 'nothing'}: "
+            f"median {statistics.median(timings):,.1f} ms, "
+            f"min {min(timings):,.1f} ms over {len(timings)} runs"
+        )
+        self.stdout.write(
+            f"Import time: {sum(row[1] for row in rows) / 1000:,.1f} ms "
+            f"across {len(rows)} modules"
+        )
+
+        project = [row for row in rows if row[0].split(".")[0] in ("api", "cvfinder")]
+        for title, selected, key in (
+            ("Slowest modules (cumulative)", rows, 2),
+            ("Slowest modules (self)", rows, 1),
+            ("Project modules (cumulative)", project, 2),
+        ):
+            self.stdout.write(f"\n{title}:")
+            for name, self_us, cumulative_us, depth in sorted(
+                selected, key=lambda row: row[key], reverse=True
+            )[: options["top"]]:
+                self.stdout.write(
+                    f"  {cumulative_us / 1000:9.1f} ms  {self_us / 1000:8.1f} ms  "
+                    f"{'  ' * min(depth, 4)}{name}"
+                )
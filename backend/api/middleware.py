@@ -0,0 +1,195 @@
+import itertools
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.http import JsonResponse
+
+
+class AdmissionClass:
+    """Concurrency budget with a bounded, time-limited wait queue."""
+
+    def __init__(self, name, limit, queue, timeout):
+        self.name = name
+        self.limit = limit
+        self.max_queue = queue
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            if self.in_flight >= self.limit:
+                if self.waiting >= self.max_queue:
+                    self.rejected += 1
+                    return False
+                self.waiting += 1
+                try:
+                    admitted = self._condition.wait_for(
+                        lambda: self.in_flight < self.limit, timeout=self.timeout
+                    )
+                finally:
+                    self.waiting -= 1
+                if not admitted:
+                    self.rejected += 1
+                    return False
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def snapshot(self):
+        return {
+            "limit": self.limit,
+            "queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+_classes = {}
+_classes_lock = threading.Lock()
+
+
+def admission_classes():
+    if not _classes:
+        with _classes_lock:
+            if not _classes:
+                for name, options in settings.ADMISSION_CONTROL["classes"].items():
+                    _classes[name] = AdmissionClass(name, **options)
+    return _classes
+
+
+def admission_stats():
+    return {
+        "pid": os.getpid(),
+        "classes": {
+            name: admission.snapshot()
+            for name, admission in admission_classes().items()
+        },
+    }
+
+
+class AdmissionControlMiddleware:
+    """Cap concurrent requests per endpoint class and shed the excess.
+
+    URL names are mapped to classes by ``ADMISSION_CONTROL["routes"]``;
+    unmapped endpoints are not limited. When a class has no free slot and its
+    wait queue is full, or the wait times out, the request is answered with
+    503 and Retry-After instead of queueing behind slower work. Streaming
+    responses keep their slot until the body has been sent.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.routes = settings.ADMISSION_CONTROL["routes"]
+        self.retry_after = settings.ADMISSION_CONTROL["retry_after"]
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        admission = getattr(request, "_admission_class", None)
+        if admission is not None:
+            if response.streaming:
+                response._resource_closers.append(admission.release)
+            else:
+                admission.release()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        class_name = self.routes.get(request.resolver_match.url_name)
+        if class_name is None:
+            return None
+        admission = admission_classes()[class_name]
+        if not admission.acquire():
+            response = JsonResponse(
+                {"error": "The server is busy, please try again shortly."},
+                status=503,
+            )
+            response["Retry-After"] = str(self.retry_after)
+            return response
+        request._admission_class = admission
+        return None
+
+
+class ProfilingMiddleware:
+    """Capture a sampling profile of selected requests.
+
+    Staff can profile a single request by sending ``X-Profile: 1`` or adding
+    ``?__profile=1``; the capture id is returned in ``X-Profile-Capture``.
+    ``PROFILING_SAMPLE_EVERY = N`` additionally profiles every Nth request
+    for continuous profiling. Captures are browsable in the admin.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_every = settings.PROFILING_SAMPLE_EVERY
+        self._counter = itertools.count(1)
+
+    def __call__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        from .models import ProfileCapture
+        from .profiling import StackSampler
+
+        sampler = StackSampler(
+            threading.get_ident(), settings.PROFILING_INTERVAL
+        ).start()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        user = getattr(request, "user", None)
+        capture = ProfileCapture.objects.create(
+            method=request.method,
+            path=request.get_full_path()[:2048],
+            status_code=response.status_code,
+            duration_ms=duration_ms,
+            samples=sampler.samples,
+            trigger=trigger,
+            user=user if user is not None and user.is_authenticated else None,
+            collapsed=sampler.collapsed(),
+        )
+        if trigger == ProfileCapture.TRIGGER_REQUEST:
+            response["X-Profile-Capture"] = str(capture.pk)
+        return response
+
+    def _trigger(self, request):
+        if (
+            request.headers.get("X-Profile") == "1"
+            or request.GET.get("__profile") == "1"
+        ):
+            if self._is_staff(request):
+                return "request"
+        if self.sample_every and next(self._counter) % self.sample_every == 0:
+            return "sampled"
+        return None
+
+    def _is_staff(self, request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return user.is_staff
+        # API clients authenticate with DRF tokens, which are only resolved
+        # inside the view, so check the header directly.
+        scheme, _, key = request.headers.get("Authorization", "").partition(" ")
+        if scheme != "Token" or not key:
+            return False
+        from rest_framework.authtoken.models import Token
+
+        return Token.objects.filter(
+            key=key.strip(), user__is_active=True, user__is_staff=True
+        ).exists()
@@ -5,11 +5,9 @@ from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
-from django.db.models.signals import pre_save
-from django.dispatch import receiver
 from django.utils import timezone
 
-from .storage import OverwriteStorage
+from .storage import resume_storage
 
 
 class CustomUser(AbstractUser):
@@ -26,6 +24,13 @@ class CustomUser(AbstractUser):
                 condition=Q(is_active=True),
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["verification_code_sent_at"],
+                name="unverified_code_sent_idx",
+                condition=Q(is_active=False),
+            )
+        ]
 
     def clean(self):
         if self.is_active:
@@ -49,10 +54,34 @@ class CustomUser(AbstractUser):
         return False
 
 
-@receiver(pre_save, sender=CustomUser)
-def deactivate_other_users_with_same_email(sender, instance, **kwargs):
-    if instance.is_active:
-        CustomUser.objects.filter(email=instance.email, is_active=False).delete()
+class Country(models.Model):
+    code = models.CharField(max_length=2, unique=True)
+    name = models.CharField(max_length=100, unique=True)
+    aliases = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        verbose_name_plural = "countries"
+
+    def __str__(self):
+        return self.name
+
+
+class Governorate(models.Model):
+    country = models.ForeignKey(
+        Country, on_delete=models.CASCADE, related_name="governorates"
+    )
+    name = models.CharField(max_length=100)
+    aliases = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["country", "name"], name="unique_governorate_per_country"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.name}, {self.country.code}"
 
 
 class Profile(models.Model):
@@ -61,6 +90,20 @@ class Profile(models.Model):
     location = models.CharField(max_length=255, blank=True)
     country = models.CharField(max_length=100, blank=True)
     governorate = models.CharField(max_length=100, blank=True)
+    country_ref = models.ForeignKey(
+        Country,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="profiles",
+    )
+    governorate_ref = models.ForeignKey(
+        Governorate,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="profiles",
+    )
     profile_picture = models.ImageField(
         upload_to="profile_pictures/", blank=True, null=True
     )
@@ -77,12 +120,24 @@ class Skill(models.Model):
         return self.name
 
 
+class SkillAlias(models.Model):
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="aliases")
+    alias = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        verbose_name_plural = "skill aliases"
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+
 class Resume(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
-    file = models.FileField(upload_to="resumes/", storage=OverwriteStorage())
+    file = models.FileField(upload_to="resumes/", storage=resume_storage)
     created_at = models.DateTimeField(auto_now_add=True)
     skills = models.ManyToManyField(Skill, blank=True)
+    extracted_text = models.TextField(blank=True)
 
     def __str__(self):
         return f"{self.user.username} - {self.title}"
@@ -91,3 +146,57 @@ class Resume(models.Model):
         if not self.pk and Resume.objects.filter(user=self.user).exists():
             raise ValidationError("You can only upload one resume.")
         super().save(*args, **kwargs)
+
+
+class ResumeFingerprint(models.Model):
+    resume = models.OneToOneField(
+        Resume, on_delete=models.CASCADE, related_name="fingerprint"
+    )
+    signature = models.BinaryField()
+    duplicate_of = models.ForeignKey(
+        Resume,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="near_duplicates",
+    )
+    similarity = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Fingerprint of {self.resume_id}"
+
+
+class ResumeLSHBucket(models.Model):
+    resume = models.ForeignKey(
+        Resume, on_delete=models.CASCADE, related_name="lsh_buckets"
+    )
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=["band", "bucket"], name="lsh_band_bucket_idx")]
+
+
+class ProfileCapture(models.Model):
+    TRIGGER_REQUEST = "request"
+    TRIGGER_SAMPLED = "sampled"
+    TRIGGER_CHOICES = [
+        (TRIGGER_REQUEST, "Requested"),
+        (TRIGGER_SAMPLED, "Continuous sampling"),
+    ]
+
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2048)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    samples = models.PositiveIntegerField()
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    collapsed = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+from collections import Counter
+
+from django.conf import settings
+
+_ROOTS = sorted(
+    {os.path.dirname(path) for path in sys.path if path} | {str(settings.BASE_DIR)},
+    key=len,
+    reverse=True,
+)
+
+
+def _frame_label(code):
+    filename = code.co_filename
+    for root in _ROOTS:
+        if filename.startswith(root + os.sep):
+            filename = filename[len(root) + 1 :]
+            break
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval.
+
+    A background thread reads the target thread's current frame, so the
+    profiled code runs untouched; overhead is one stack walk per interval.
+    Results are folded into collapsed-stack lines (``a;b;c count``), the
+    format speedscope and flamegraph.pl import directly.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.items())
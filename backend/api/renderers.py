@@ -0,0 +1,20 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    # orjson handles dict/list/str subclasses natively; anything else
+    # (lazy translations, Decimal, UUID subclasses...) goes through DRF's encoder.
+    _fallback = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(
+            data, default=self._fallback, option=orjson.OPT_NON_STR_KEYS
+        )
@@ -1,7 +1,10 @@
+from django.utils import timezone
+from django.utils.encoding import filepath_to_uri
 from rest_framework import serializers
 
 from .models import CustomUser  # Ensure you import your CustomUser model
 from .models import Profile, Resume
+from .storage import is_remote
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -34,3 +37,112 @@ class ResumeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Resume
         fields = ["id", "title", "file", "created_at"]
+
+
+# Lightweight read path for list responses. These build plain dicts straight
+# from ``.values()`` rows and produce the same output as the serializers
+# above, without instantiating a field tree for every row.
+
+USER_FIELDS = ["id", "username", "email"]
+PROFILE_FIELDS = ["bio", "country", "governorate", "profile_picture", "created_at"]
+RESUME_FIELDS = ["id", "title", "file", "created_at"]
+
+
+def format_datetime(value):
+    if value is None:
+        return None
+    value = timezone.localtime(value).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class MediaURLBuilder:
+    def __init__(self, storage, request=None):
+        self.storage = storage
+        self.prefix = None
+        if not is_remote(storage):
+            base_url = storage.base_url
+            self.prefix = request.build_absolute_uri(base_url) if request else base_url
+
+    def __call__(self, name):
+        if not name:
+            return None
+        if self.prefix is None:
+            # Object storage URLs are presigned per object.
+            return self.storage.url(name)
+        return self.prefix + filepath_to_uri(name).lstrip("/")
+
+
+def user_row(user):
+    return {field: getattr(user, field) for field in USER_FIELDS}
+
+
+def profile_rows(rows, request=None):
+    picture_url = MediaURLBuilder(
+        Profile._meta.get_field("profile_picture").storage, request
+    )
+    return [
+        {
+            "bio": row["bio"],
+            "country": row["country"],
+            "governorate": row["governorate"],
+            "profile_picture": picture_url(row["profile_picture"]),
+            "created_at": format_datetime(row["created_at"]),
+        }
+        for row in rows
+    ]
+
+
+def resume_rows(rows, request=None):
+    file_url = MediaURLBuilder(Resume._meta.get_field("file").storage, request)
+    return [
+        {
+            "id": row["id"],
+            "title": row["title"],
+            "file": file_url(row["file"]),
+            "created_at": format_datetime(row["created_at"]),
+        }
+        for row in rows
+    ]
+
+
+def profile_payloads(users, request=None):
+    """Build public profile payloads for users fetched with
+    ``select_related("profile")`` and ``prefetch_related("resume_set__skills")``.
+    """
+    picture_url = MediaURLBuilder(
+        Profile._meta.get_field("profile_picture").storage, request
+    )
+    file_url = MediaURLBuilder(Resume._meta.get_field("file").storage)
+    payloads = {}
+    for user in users:
+        try:
+            profile = user.profile
+        except Profile.DoesNotExist:
+            profile = None
+        payloads[user.username] = {
+            "user": user_row(user),
+            "profile": (
+                {
+                    "bio": profile.bio,
+                    "country": profile.country,
+                    "governorate": profile.governorate,
+                    "profile_picture": picture_url(profile.profile_picture.name),
+                    "created_at": format_datetime(profile.created_at),
+                }
+                if profile
+                else {}
+            ),
+            "resumes": [
+                {
+                    "id": resume.id,
+                    "title": resume.title,
+                    "file": file_url(resume.file.name),
+                    "created_at": format_datetime(resume.created_at),
+                    "skills": sorted(skill.name for skill in resume.skills.all()),
+                }
+                for resume in user.resume_set.all()
+            ],
+        }
+    return payloads
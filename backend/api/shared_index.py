@@ -0,0 +1,100 @@
+import logging
+import os
+import threading
+import time
+
+from django.db import transaction
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+
+class SharedIndex:
+    """Per-process in-memory index kept in step across workers via Redis.
+
+    ``build()`` loads the index from the database. Writers call
+    ``bump_on_commit()``, which increments ``<name>:generation`` and publishes
+    it on ``<name>:invalidate`` once their transaction commits. A daemon
+    thread in each process records the latest generation it has heard about;
+    lookups compare that with the generation the index was built at and
+    rebuild only when it is behind. The thread is started lazily and again
+    after a fork, since threads do not survive into forked workers.
+    """
+
+    def __init__(self, name, build):
+        self.name = name
+        self.generation_key = f"{name}:generation"
+        self.channel = f"{name}:invalidate"
+        self._build = build
+        self._lock = threading.Lock()
+        self._index = None
+        self._generation = 0
+        self._latest = 0
+        self._pid = None
+
+    def current_generation(self):
+        return int(get_redis_connection("default").get(self.generation_key) or 0)
+
+    def bump(self):
+        """Tell every process that the underlying tables changed."""
+        redis = get_redis_connection("default")
+        generation = redis.incr(self.generation_key)
+        redis.publish(self.channel, generation)
+        return generation
+
+    def bump_on_commit(self, using=None):
+        """Bump the generation once the current transaction commits.
+
+        Other workers rebuild from the database as soon as they hear about
+        the bump, so announcing uncommitted rows would leave them with a
+        stale index labelled as current. Bulk writes such as ``loaddata``
+        save every row in one transaction; they are announced once rather
+        than once per row.
+        """
+        connection = transaction.get_connection(using)
+        if any(func == self.bump for _, func, _ in connection.run_on_commit):
+            return
+        transaction.on_commit(self.bump, using=using, robust=True)
+
+    def get(self):
+        self._ensure_listener()
+        index = self._index
+        if index is None or self._generation < self._latest:
+            with self._lock:
+                index = self._index
+                if index is None or self._generation < self._latest:
+                    generation = self.current_generation()
+                    index = self._build()
+                    self._index, self._generation = index, generation
+                    self._latest = max(self._latest, generation)
+        return index
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._index = None
+            threading.Thread(
+                target=self._listen, name=f"{self.name}-index-listener", daemon=True
+            ).start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = get_redis_connection("default").pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(self.channel)
+                # Anything published while we were disconnected was missed,
+                # so resynchronise from the stored generation first.
+                self._latest = max(self._latest, self.current_generation())
+                for message in pubsub.listen():
+                    self._latest = max(self._latest, int(message["data"]))
+            except Exception:
+                logger.warning(
+                    "%s index listener disconnected", self.name, exc_info=True
+                )
+                time.sleep(5)
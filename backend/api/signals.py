@@ -1,11 +1,83 @@
-from django.db.models.signals import post_save
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from .http_cache import bump_version_on_commit, user_scope
+from .locations import invalidate_location_index
 from .models import CustomUser  # Ensure you import your CustomUser model
-from .models import Profile
+from .models import Country, Governorate, Profile, Resume, Skill, SkillAlias
+from .skills import bump_generation_on_commit
 
 
 @receiver(post_save, sender=CustomUser)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
+
+
+@receiver(pre_save, sender=CustomUser)
+def remember_previous_username(sender, instance, raw, update_fields, **kwargs):
+    # RegisterView can hand an inactive account a new username; responses
+    # cached under the old one must be invalidated as well.
+    instance._previous_username = None
+    if raw or not instance.pk:
+        return
+    if update_fields is None or "username" in update_fields:
+        instance._previous_username = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list("username", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_responses(sender, instance, using, **kwargs):
+    bump_version_on_commit(user_scope(instance.username), using)
+    previous = getattr(instance, "_previous_username", None)
+    if previous and previous != instance.username:
+        bump_version_on_commit(user_scope(previous), using)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_save, sender=Resume)
+@receiver(post_delete, sender=Resume)
+def invalidate_owner_responses(sender, instance, using, **kwargs):
+    try:
+        username = instance.user.username
+    except ObjectDoesNotExist:
+        return
+    bump_version_on_commit(user_scope(username), using)
+
+
+@receiver(m2m_changed, sender=Resume.skills.through)
+def invalidate_resume_skill_responses(
+    sender, instance, action, reverse, pk_set, using, **kwargs
+):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        bump_version_on_commit(user_scope(instance.user.username), using)
+    elif pk_set:
+        usernames = Resume.objects.filter(pk__in=pk_set).values_list(
+            "user__username", flat=True
+        )
+        for username in usernames:
+            bump_version_on_commit(user_scope(username), using)
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+@receiver(post_save, sender=Governorate)
+@receiver(post_delete, sender=Governorate)
+def reset_location_index(sender, using, **kwargs):
+    invalidate_location_index(using)
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=SkillAlias)
+@receiver(post_delete, sender=SkillAlias)
+def announce_skill_change(sender, using, **kwargs):
+    bump_generation_on_commit(using)
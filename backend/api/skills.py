@@ -0,0 +1,80 @@
+import re
+
+from .autocomplete import PrefixIndex, normalize, word_suffixes
+from .models import Skill, SkillAlias
+from .shared_index import SharedIndex
+
+_TOKEN_RE = re.compile(r"[^\s,;:()\[\]{}|]+")
+
+
+class SkillIndex:
+    def __init__(self, skills, aliases):
+        self.canonical = {}
+        self.short_names = set()
+        items = {}
+        entries = []
+
+        for skill in skills:
+            item = {"id": skill.id, "name": skill.name}
+            items[skill.id] = item
+            self.canonical[normalize(skill.name)] = skill.id
+            if len(skill.name) <= 2:
+                self.short_names.add(skill.name)
+            for key, word_rank in word_suffixes(normalize(skill.name)):
+                entries.append((key, (word_rank, 0), skill.id, item))
+
+        for alias in aliases:
+            item = items.get(alias.skill_id)
+            if item is None:
+                continue
+            self.canonical.setdefault(normalize(alias.alias), alias.skill_id)
+            if len(alias.alias) <= 2:
+                self.short_names.add(alias.alias)
+            for key, word_rank in word_suffixes(normalize(alias.alias)):
+                entries.append((key, (word_rank, 1), alias.skill_id, item))
+
+        self.prefixes = PrefixIndex(entries)
+
+    def search(self, query, limit=10):
+        return self.prefixes.search(query, limit=limit)
+
+    def canonicalize(self, name):
+        return self.canonical.get(normalize(name))
+
+    def find_in_text(self, text, max_words=3):
+        """Return the ids of skills mentioned anywhere in ``text``.
+
+        Names of one or two characters ("R", "Go", "JS") only match with
+        their exact casing, so ordinary words are not tagged as skills.
+        """
+        tokens = [token.strip("./") for token in _TOKEN_RE.findall(text)]
+        found = set()
+        for size in range(1, max_words + 1):
+            for start in range(len(tokens) - size + 1):
+                phrase = " ".join(tokens[start : start + size])
+                skill_id = self.canonical.get(normalize(phrase))
+                if skill_id is None:
+                    continue
+                if len(phrase) <= 2 and phrase not in self.short_names:
+                    continue
+                found.add(skill_id)
+        return found
+
+
+def build_skill_index():
+    return SkillIndex(Skill.objects.all(), SkillAlias.objects.all())
+
+
+_shared = SharedIndex("skills", build_skill_index)
+
+
+def current_generation():
+    return _shared.current_generation()
+
+
+def bump_generation_on_commit(using=None):
+    _shared.bump_on_commit(using)
+
+
+def get_skill_index():
+    return _shared.get()
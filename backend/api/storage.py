@@ -1,3 +1,6 @@
+import time
+
+from django.conf import settings
 from django.core.files.storage import FileSystemStorage
 
 
@@ -6,3 +9,27 @@ class OverwriteStorage(FileSystemStorage):
         if self.exists(name):
             self.delete(name)
         return name
+
+
+def resume_storage():
+    if settings.AWS_STORAGE_BUCKET_NAME:
+        from storages.backends.s3 import S3Storage
+
+        return S3Storage(file_overwrite=True)
+    return OverwriteStorage()
+
+
+def is_remote(storage):
+    return not isinstance(storage, FileSystemStorage)
+
+
+def signed_url_window():
+    """Identify the current validity window of presigned media URLs.
+
+    Cached responses embedding presigned URLs include this in their ETag, so
+    clients and caches pick up fresh URLs at least halfway through their
+    lifetime. Local media URLs never expire and always return ``""``.
+    """
+    if not settings.AWS_STORAGE_BUCKET_NAME:
+        return ""
+    return str(int(time.time() // (settings.AWS_QUERYSTRING_EXPIRE // 2)))
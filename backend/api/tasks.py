@@ -1,6 +1,9 @@
+from datetime import timedelta
+
 from celery import shared_task
 from django.conf import settings
 from django.core.mail import send_mail
+from django.utils import timezone
 
 
 @shared_task
@@ -14,3 +17,74 @@ def send_verification_email(email, verification_code):
         [email],
         fail_silently=False,
     )
+
+
+def _extract_and_fingerprint(resume):
+    from .dedup import index_resume
+    from .extraction import extract_text
+
+    resume.extracted_text = extract_text(resume.file)
+    resume.save(update_fields=["extracted_text"])
+    return index_resume(resume, resume.extracted_text)
+
+
+@shared_task(acks_late=True)
+def fingerprint_resume(resume_id):
+    from .models import Resume
+
+    resume = Resume.objects.filter(pk=resume_id).first()
+    if resume is None:
+        return None
+    fingerprint = _extract_and_fingerprint(resume)
+    return fingerprint.duplicate_of_id if fingerprint else None
+
+
+@shared_task(acks_late=True)
+def reextract_resumes(resume_ids):
+    from .models import Resume
+
+    for resume in Resume.objects.filter(pk__in=resume_ids).order_by("pk"):
+        _extract_and_fingerprint(resume)
+    return len(resume_ids)
+
+
+@shared_task(acks_late=True)
+def tag_resume_skills(resume_ids):
+    from .models import Resume
+    from .skills import get_skill_index
+
+    index = get_skill_index()
+    resumes = Resume.objects.filter(pk__in=resume_ids).only("pk", "extracted_text")
+    for resume in resumes:
+        resume.skills.set(index.find_in_text(resume.extracted_text))
+    return len(resume_ids)
+
+
+@shared_task
+def purge_unverified_accounts(batch_size=1000, max_batches=100):
+    from .models import CustomUser
+
+    cutoff = timezone.now() - timedelta(hours=settings.UNVERIFIED_ACCOUNT_MAX_AGE_HOURS)
+    # Verification clears verification_code_sent_at, so only accounts with a
+    # code still pending qualify. Deactivated verified accounts and rows
+    # without a recorded send time are never deleted.
+    stale = CustomUser.objects.filter(
+        is_active=False, verification_code_sent_at__lt=cutoff
+    )
+
+    deleted = 0
+    for _ in range(max_batches):
+        ids = list(stale.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            break
+        CustomUser.objects.filter(pk__in=ids).delete()
+        deleted += len(ids)
+    return deleted
+
+
+@shared_task
+def purge_shadowed_accounts(email):
+    from .models import CustomUser
+
+    if CustomUser.objects.filter(email=email, is_active=True).exists():
+        CustomUser.objects.filter(email=email, is_active=False).delete()
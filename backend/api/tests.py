@@ -1,3 +1,456 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django_redis import get_redis_connection
+from rest_framework.authtoken.models import Token
+
+from .exports import CHUNK_SIZE, stream_zip
+from .hashers import TunedArgon2PasswordHasher
+from .http_cache import VERSION_KEY, user_scope
+from .locations import _shared as shared_locations
+from .locations import build_location_index
+from .middleware import AdmissionClass, admission_classes
+from .models import (
+    Country,
+    CustomUser,
+    Governorate,
+    Profile,
+    ProfileCapture,
+    Resume,
+    Skill,
+    SkillAlias,
+)
+from .skills import current_generation
+from .tasks import purge_unverified_accounts
+
+
+class ProfileETagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username="alice", email="alice@example.com", password="secret-123"
+        )
+        self.resume = Resume.objects.create(
+            user=self.user, title="CV", file="resumes/alice.pdf"
+        )
+        self.skill = Skill.objects.create(name="Django")
+        Profile.objects.filter(user=self.user).update(
+            profile_picture="profile_pictures/a.png"
+        )
+
+    def fetch(self, username="alice", etag=None, **extra):
+        if etag:
+            extra["HTTP_IF_NONE_MATCH"] = etag
+        return self.client.get(
+            reverse("public-profile", kwargs={"username": username}), **extra
+        )
+
+    def assertInvalidated(self, etag):
+        response = self.fetch(etag=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        return response
+
+    def test_matching_etag_returns_304(self):
+        response = self.fetch()
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        response = self.fetch(etag=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_anonymous_responses_are_public(self):
+        response = self.fetch()
+        self.assertEqual(response["Cache-Control"], "no-cache, public")
+
+    def test_unknown_username_writes_no_version(self):
+        response = self.fetch(username="nobody")
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(cache.get(VERSION_KEY.format(scope=user_scope("nobody"))))
+
+    def test_entries_are_keyed_by_scheme_and_host(self):
+        picture = "profile_pictures/a.png"
+        first = self.fetch(HTTP_HOST="localhost")
+        self.assertEqual(
+            first.json()["profile"]["profile_picture"],
+            f"http://localhost/media/{picture}",
+        )
+        for extra, base in (
+            ({"HTTP_HOST": "testserver"}, "http://testserver"),
+            ({"HTTP_HOST": "localhost", "secure": True}, "https://localhost"),
+        ):
+            response = self.fetch(etag=first["ETag"], **extra)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.json()["profile"]["profile_picture"],
+                f"{base}/media/{picture}",
+            )
+
+    def test_changes_are_announced_after_commit(self):
+        etag = self.fetch()["ETag"]
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.resume.title = "Updated CV"
+            self.resume.save()
+            self.assertEqual(self.fetch(etag=etag).status_code, 304)
+        self.assertEqual(self.fetch(etag=etag).status_code, 304)
+        for callback in callbacks:
+            callback()
+        self.assertInvalidated(etag)
+
+    def test_lost_versions_do_not_revive_old_etags(self):
+        # A user that was never bumped, e.g. created before deployment.
+        cache.delete(VERSION_KEY.format(scope=user_scope("alice")))
+        etag = self.fetch()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.resume.title = "Updated CV"
+            self.resume.save()
+        self.assertInvalidated(etag)
+        cache.clear()
+        self.assertInvalidated(etag)
+
+    def test_profile_change_invalidates(self):
+        etag = self.fetch()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = self.user.profile
+            profile.bio = "Backend developer"
+            profile.save()
+        response = self.assertInvalidated(etag)
+        self.assertEqual(response.json()["profile"]["bio"], "Backend developer")
+
+    def test_resume_change_invalidates(self):
+        etag = self.fetch()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.resume.title = "Updated CV"
+            self.resume.save()
+        self.assertInvalidated(etag)
+
+        etag = self.fetch()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.resume.delete()
+        self.assertEqual(self.assertInvalidated(etag).json()["resumes"], [])
+
+    def test_skill_changes_invalidate(self):
+        etag = self.fetch()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.resume.skills.add(self.skill)
+        etag = self.assertInvalidated(etag)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.skill.resume_set.remove(self.resume)
+        self.assertInvalidated(etag)
+
+    def test_renamed_user_invalidates_old_username(self):
+        etag = self.fetch()["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = "alice2"
+            self.user.save()
+        self.assertEqual(self.fetch(etag=etag).status_code, 404)
+        self.assertEqual(self.fetch(username="alice2").status_code, 200)
+
+
+class TunedArgon2HasherTests(TestCase):
+    @override_settings(PASSWORD_ARGON2_TIME_COST=2, PASSWORD_ARGON2_MEMORY_COST=8192)
+    def test_cost_follows_settings(self):
+        encoded = make_password("secret-123")
+        self.assertTrue(encoded.startswith("argon2$argon2id$v=19$m=8192,t=2,p=1$"))
+
+        with self.settings(PASSWORD_ARGON2_TIME_COST=3):
+            hasher = identify_hasher(encoded)
+            self.assertIsInstance(hasher, TunedArgon2PasswordHasher)
+            self.assertTrue(hasher.must_update(encoded))
+            self.assertIn(",t=3,", make_password("secret-123"))
+
+
+class SkillInvalidationTests(TransactionTestCase):
+    def test_generation_bumped_once_after_commit(self):
+        before = current_generation()
+        with transaction.atomic():
+            skill = Skill.objects.create(name="Django")
+            SkillAlias.objects.create(skill=skill, alias="django-framework")
+            self.assertEqual(current_generation(), before)
+        self.assertEqual(current_generation(), before + 1)
+
+    def test_canonicalize_rejects_non_string_names(self):
+        response = self.client.post(
+            reverse("skill-canonicalize"),
+            {"names": [["a"]]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class LocationIndexTests(TransactionTestCase):
+    def setUp(self):
+        self.country = Country.objects.create(code="SY", name="Syria")
+        Governorate.objects.create(country=self.country, name="Damascus")
+
+    def test_search_filters_by_country(self):
+        index = build_location_index()
+        results = index.search("da", country="Syria")
+        self.assertEqual([item["name"] for item in results], ["Damascus"])
+        self.assertEqual(index.search("da", country="Lebanon"), [])
+
+    def test_changes_bump_generation_after_commit(self):
+        before = shared_locations.current_generation()
+        with transaction.atomic():
+            Governorate.objects.create(country=self.country, name="Aleppo")
+            self.assertEqual(shared_locations.current_generation(), before)
+        self.assertEqual(shared_locations.current_generation(), before + 1)
+
+
+class ProfileBatchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username="alice", email="alice@example.com", password="secret-123"
+        )
+        resume = Resume.objects.create(
+            user=self.user, title="CV", file="resumes/alice.pdf"
+        )
+        resume.skills.add(Skill.objects.create(name="Python"))
+
+    def batch(self, usernames):
+        return self.client.post(
+            reverse("profile-batch"),
+            {"usernames": usernames},
+            content_type="application/json",
+        )
+
+    def test_unknown_usernames_leave_no_keys(self):
+        redis = get_redis_connection("default")
+        keys_before = set(redis.keys("*"))
+        response = self.batch([f"ghost{i}" for i in range(20)])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {item.get("error") for item in response.json()["results"]},
+            {"User not found."},
+        )
+        self.assertEqual(set(redis.keys("*")), keys_before)
+
+    def test_payload_matches_single_profile(self):
+        single = self.client.get(
+            reverse("public-profile", kwargs={"username": "alice"})
+        ).json()
+        for _ in range(2):  # Uncached, then cached.
+            (result,) = self.batch(["alice"]).json()["results"]
+            self.assertEqual(result, {"username": "alice", **single})
+        self.assertEqual(single["resumes"][0]["skills"], ["Python"])
+
+
+class PurgeUnverifiedAccountsTests(TestCase):
+    def create_user(self, username, is_active, sent_hours_ago):
+        return CustomUser.objects.create_user(
+            username=username,
+            email=f"{username}@example.com",
+            password="secret-123",
+            is_active=is_active,
+            verification_code="12345678",
+            verification_code_sent_at=timezone.now() - timedelta(hours=sent_hours_ago),
+        )
+
+    @override_settings(UNVERIFIED_ACCOUNT_MAX_AGE_HOURS=48)
+    def test_purges_only_expired_unverified_accounts(self):
+        self.create_user("expired", is_active=False, sent_hours_ago=72)
+        self.create_user("pending", is_active=False, sent_hours_ago=1)
+        verified = self.create_user("verified", is_active=False, sent_hours_ago=72)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("verify-email"),
+                {
+                    "email": verified.email,
+                    "username": verified.username,
+                    "verification_code": "12345678",
+                },
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 200)
+        CustomUser.objects.filter(pk=verified.pk).update(is_active=False)
+
+        self.assertEqual(purge_unverified_accounts(), 1)
+        self.assertEqual(
+            set(CustomUser.objects.values_list("username", flat=True)),
+            {"pending", "verified"},
+        )
+
+
+class StreamZipTests(SimpleTestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.storage = FileSystemStorage(location=media.name)
+        self.date = timezone.now()
+
+    def entry(self, arcname, name, storage=None):
+        field = SimpleNamespace(storage=storage or self.storage, name=name)
+        return arcname, field, self.date
+
+    def test_streams_stored_entries_and_skips_missing_files(self):
+        big = os.urandom(3 * CHUNK_SIZE + 123)
+        self.storage.save("resumes/a.pdf", ContentFile(b"%PDF-a"))
+        self.storage.save("resumes/b.pdf", ContentFile(big))
+        s3 = mock.Mock()
+        s3.open.side_effect = ClientError(
+            {
+                "Error": {"Code": "404", "Message": "Not Found"},
+                "ResponseMetadata": {"HTTPStatusCode": 404},
+            },
+            "HeadObject",
+        )
+
+        chunks = list(
+            stream_zip(
+                [
+                    self.entry("alice_resume.pdf", "resumes/a.pdf"),
+                    self.entry("ghost_resume.pdf", "resumes/missing.pdf"),
+                    self.entry("s3_resume.pdf", "resumes/gone.pdf", storage=s3),
+                    self.entry("bob_resume.pdf", "resumes/b.pdf"),
+                ]
+            )
+        )
+        self.assertGreater(len(chunks), 4)
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.namelist(), ["alice_resume.pdf", "bob_resume.pdf"])
+            for info in archive.infolist():
+                self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+                self.assertTrue(info.flag_bits & 0x08)  # Data descriptor.
+            self.assertEqual(archive.read("alice_resume.pdf"), b"%PDF-a")
+            self.assertEqual(archive.read("bob_resume.pdf"), big)
+
+    def test_other_storage_errors_propagate(self):
+        s3 = mock.Mock()
+        s3.open.side_effect = ClientError(
+            {
+                "Error": {"Code": "403", "Message": "Forbidden"},
+                "ResponseMetadata": {"HTTPStatusCode": 403},
+            },
+            "HeadObject",
+        )
+        with self.assertRaises(ClientError):
+            list(stream_zip([self.entry("a.pdf", "resumes/a.pdf", storage=s3)]))
+
+
+class AdmissionControlTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        # Swap in a fresh "files" class so budgets do not leak between tests.
+        self.files = AdmissionClass("files", limit=1, queue=0, timeout=0.1)
+        classes = mock.patch.dict(admission_classes(), {"files": self.files})
+        classes.start()
+        self.addCleanup(classes.stop)
+
+        self.user = CustomUser.objects.create_user(
+            username="alice", email="alice@example.com", password="secret-123"
+        )
+        Resume.objects.create(
+            user=self.user, title="CV", file=ContentFile(b"%PDF-1.4", name="a.pdf")
+        )
+        self.token = Token.objects.create(user=self.user)
+
+    def download(self):
+        return self.client.get(reverse("resume-download", kwargs={"username": "alice"}))
+
+    def export(self):
+        return self.client.post(
+            reverse("resume-export"),
+            {"usernames": ["alice"]},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Token {self.token.key}",
+        )
+
+    def test_saturated_class_returns_503(self):
+        self.assertTrue(self.files.acquire())
+        try:
+            response = self.download()
+        finally:
+            self.files.release()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            response["Retry-After"], str(settings.ADMISSION_CONTROL["retry_after"])
+        )
+        self.assertEqual(self.files.rejected, 1)
+
+    def test_queued_request_admitted_after_release(self):
+        admission = AdmissionClass("test", limit=1, queue=1, timeout=5)
+        self.assertTrue(admission.acquire())
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(admission.acquire()))
+        waiter.start()
+        for _ in range(500):
+            if admission.waiting:
+                break
+            time.sleep(0.01)
+        self.assertEqual(admission.waiting, 1)
+        self.assertFalse(admission.acquire())  # Queue is full.
+
+        admission.release()
+        waiter.join(timeout=5)
+        self.assertEqual(results, [True])
+        self.assertEqual(admission.snapshot()["in_flight"], 1)
+
+    def test_streaming_responses_hold_slot_until_closed(self):
+        for request in (self.download, self.export):
+            with self.subTest(request.__name__):
+                response = request()
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.streaming)
+                self.assertEqual(self.files.in_flight, 1)
+                self.assertEqual(self.download().status_code, 503)
+
+                b"".join(response.streaming_content)
+                response.close()
+                self.assertEqual(self.files.in_flight, 0)
+
+
+class ProfileCaptureAdminTests(TestCase):
+    def setUp(self):
+        self.capture = ProfileCapture.objects.create(
+            method="GET",
+            path="/api/password-reset-confirm/abc/token/",
+            status_code=200,
+            duration_ms=12.5,
+            samples=3,
+            trigger=ProfileCapture.TRIGGER_REQUEST,
+            collapsed="main;view 3",
+        )
+        self.staff = CustomUser.objects.create_user(
+            username="staff", email="staff@example.com", password="secret-123"
+        )
+        self.staff.is_staff = True
+        self.staff.save()
+        self.client.force_login(self.staff)
+        self.url = reverse("admin:api_profilecapture_collapsed", args=[self.capture.pk])
+
+    def test_requires_view_permission(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        self.staff.user_permissions.add(
+            Permission.objects.get(codename="view_profilecapture")
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"main;view 3")
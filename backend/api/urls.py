@@ -1,16 +1,23 @@
 from django.urls import path
 
 from .views import (
+    AdmissionStatsView,
+    LocationAutocompleteView,
     LoginView,
     LogoutView,
     PasswordResetConfirmView,
     PasswordResetView,
+    ProfileBatchView,
+    ProfilePictureView,
     PublicUserProfileView,
     RegisterView,
     ResumeDeleteView,
     ResumeDownloadView,
+    ResumeExportView,
     ResumeUploadView,
     ResumeViewPDF,
+    SkillAutocompleteView,
+    SkillCanonicalizeView,
     UpdateProfileView,
     UserProfileView,
     VerifyEmailView,
@@ -43,9 +50,32 @@ urlpatterns = [
         ResumeDownloadView.as_view(),
         name="resume-download",
     ),
+    path("resume/export/", ResumeExportView.as_view(), name="resume-export"),
+    path("profiles/batch/", ProfileBatchView.as_view(), name="profile-batch"),
+    path(
+        "profile/<str:username>/picture/",
+        ProfilePictureView.as_view(),
+        name="profile-picture",
+    ),
     path(
         "profile/<str:username>/",
         PublicUserProfileView.as_view(),
         name="public-profile",
     ),
+    path(
+        "locations/autocomplete/",
+        LocationAutocompleteView.as_view(),
+        name="location-autocomplete",
+    ),
+    path(
+        "skills/autocomplete/",
+        SkillAutocompleteView.as_view(),
+        name="skill-autocomplete",
+    ),
+    path(
+        "skills/canonicalize/",
+        SkillCanonicalizeView.as_view(),
+        name="skill-canonicalize",
+    ),
+    path("admission/stats/", AdmissionStatsView.as_view(), name="admission-stats"),
 ]
@@ -1,29 +1,57 @@
-import imghdr
 from datetime import timedelta
 
-import redis
 from django.conf import settings
-from django.contrib.auth import authenticate, get_user_model, update_session_auth_hash
+from django.contrib.auth import get_user_model, update_session_auth_hash
 from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.mail import send_mail
 from django.db import IntegrityError
-from django.http import FileResponse, Http404, JsonResponse
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.utils.crypto import get_random_string
+from django.utils.functional import SimpleLazyObject
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from django_redis import get_redis_connection
 from rest_framework import generics, status
 from rest_framework.authtoken.models import Token
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from . import hashing
+from .exports import stream_zip
+from .http_cache import cached_json_response, get_versions, user_scope
+from .locations import get_location_index
+from .middleware import admission_stats
 from .models import CustomUser, Profile, Resume
-from .serializers import ProfileSerializer, ResumeSerializer, UserSerializer
-from .tasks import send_verification_email
-
-r = redis.StrictRedis.from_url(settings.CACHES["default"]["LOCATION"])
+from .renderers import ORJSONRenderer
+from .serializers import (
+    PROFILE_FIELDS,
+    RESUME_FIELDS,
+    ProfileSerializer,
+    profile_payloads,
+    profile_rows,
+    resume_rows,
+    user_row,
+)
+from .skills import get_skill_index
+from .storage import is_remote, signed_url_window
+from .tasks import (
+    fingerprint_resume,
+    purge_shadowed_accounts,
+    send_verification_email,
+)
+
+# Resolved on first use, after any fork, so importing views never touches Redis.
+r = SimpleLazyObject(lambda: get_redis_connection("default"))
 
 MAX_ATTEMPTS = 3
 
@@ -52,7 +80,12 @@ class RegisterView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        existing_user = get_user_model().objects.filter(email=email).first()
+        existing_user = (
+            get_user_model()
+            .objects.filter(email=email)
+            .order_by("-is_active", "-date_joined")
+            .first()
+        )
         if existing_user:
             if existing_user.is_active:
                 return Response(
@@ -61,11 +94,12 @@ class RegisterView(APIView):
                 )
             else:
                 existing_user.username = username
-                existing_user.set_password(password)
+                hashing.set_password(existing_user, password)
                 verification_code = get_random_string(
                     length=8, allowed_chars="0123456789"
                 )
                 existing_user.verification_code = verification_code
+                existing_user.verification_code_sent_at = timezone.now()
                 existing_user.is_active = False  # remain inactive until verified
                 try:
                     existing_user.save()
@@ -88,11 +122,12 @@ class RegisterView(APIView):
             # Create a new user if the email is not found at all.
             try:
                 user = User(username=username, email=email)
-                user.set_password(password)
+                hashing.set_password(user, password)
                 verification_code = get_random_string(
                     length=8, allowed_chars="0123456789"
                 )
                 user.verification_code = verification_code
+                user.verification_code_sent_at = timezone.now()
                 user.is_active = False
                 user.save()
             except IntegrityError as e:
@@ -137,10 +172,13 @@ class VerifyEmailView(APIView):
                 length=8, allowed_chars="0123456789"
             )
             user = (
-                get_user_model().objects.filter(email=email, username=username).first()
+                get_user_model()
+                .objects.filter(email=email, username=username, is_active=False)
+                .first()
             )
             if user:
                 user.verification_code = new_verification_code
+                user.verification_code_sent_at = timezone.now()
                 user.save()
                 send_verification_email.delay(email, verification_code)
             time_left = timedelta(seconds=int(r.ttl(attempt_key)))
@@ -177,7 +215,12 @@ class VerifyEmailView(APIView):
             r.delete(last_failed_time_key)
 
             user.is_active = True
+            # A cleared code marks the account as verified; the purge task
+            # only deletes inactive accounts that still have one pending.
+            user.verification_code = None
+            user.verification_code_sent_at = None
             user.save()
+            purge_shadowed_accounts.delay(email)
 
             try:
                 Profile.objects.get(user=user)
@@ -202,7 +245,7 @@ class LoginView(generics.GenericAPIView):
     def post(self, request):
         username = request.data.get("username")
         password = request.data.get("password")
-        user = authenticate(username=username, password=password)
+        user = hashing.authenticate(username, password)
 
         if user:
             token, _ = Token.objects.get_or_create(user=user)
@@ -215,45 +258,114 @@ class LoginView(generics.GenericAPIView):
 # User Profile API
 
 
+def profile_response_data(user, request):
+    profile = Profile.objects.filter(user=user).values(*PROFILE_FIELDS)[:1]
+    resumes = Resume.objects.filter(user=user).values(*RESUME_FIELDS)
+    profiles = profile_rows(profile, request)
+
+    # Same shape as the batch endpoint's payloads, which include skills.
+    skills = {}
+    for resume_id, name in Resume.skills.through.objects.filter(
+        resume__user=user
+    ).values_list("resume_id", "skill__name"):
+        skills.setdefault(resume_id, []).append(name)
+    rows = resume_rows(resumes)
+    for row in rows:
+        row["skills"] = sorted(skills.get(row["id"], []))
+
+    return {
+        "user": user_row(user),
+        "profile": profiles[0] if profiles else {},
+        "resumes": rows,
+    }
+
+
 class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        user = request.user
-        profile = Profile.objects.filter(user=user).first()
-        resumes = Resume.objects.filter(user=user)
+    renderer_classes = [ORJSONRenderer]
 
+    @cached_json_response(lambda request: user_scope(request.user.username))
+    def get(self, request):
         return Response(
-            {
-                "user": UserSerializer(user).data,
-                "profile": (
-                    ProfileSerializer(profile, context={"request": request}).data
-                    if profile
-                    else {}
-                ),
-                "resumes": ResumeSerializer(resumes, many=True).data,
-            },
-            status=status.HTTP_200_OK,
+            profile_response_data(request.user, request), status=status.HTTP_200_OK
         )
 
 
 class PublicUserProfileView(APIView):
     permission_classes = [AllowAny]
+    renderer_classes = [ORJSONRenderer]
 
+    @cached_json_response(lambda request, username, **kwargs: user_scope(username))
     def get(self, request, username, *args, **kwargs):
         user = get_object_or_404(User, username=username)
-        profile = Profile.objects.filter(user=user).first()
-        resumes = Resume.objects.filter(user=user)
+        return Response(profile_response_data(user, request), status=status.HTTP_200_OK)
+
+
+class ProfileBatchView(APIView):
+    permission_classes = [AllowAny]
+    renderer_classes = [ORJSONRenderer]
+
+    def post(self, request, *args, **kwargs):
+        usernames = request.data.get("usernames")
+        max_profiles = settings.PROFILE_BATCH_MAX
+        if (
+            not isinstance(usernames, list)
+            or not usernames
+            or len(usernames) > max_profiles
+        ):
+            return Response(
+                {"error": f"Provide a list of 1 to {max_profiles} usernames."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        usernames = list(dict.fromkeys(map(str, usernames)))
+
+        # Only existing users get a cache lookup, so unknown names cost one
+        # indexed query and touch nothing in Redis.
+        existing = list(
+            User.objects.filter(username__in=usernames).values_list(
+                "username", flat=True
+            )
+        )
+        # Cache entries are keyed by each user's resource version, so any
+        # profile or resume change makes the old entry unreachable.
+        versions = get_versions(user_scope(username) for username in existing)
+        prefix = (
+            f"profile_payload:{request.build_absolute_uri('/')}:{signed_url_window()}"
+        )
+        keys = {
+            username: f"{prefix}:{username}:{versions[user_scope(username)]}"
+            for username in existing
+        }
+        cached = cache.get_many(list(keys.values()))
+        payloads = {
+            username: cached[key] for username, key in keys.items() if key in cached
+        }
+
+        missing = [username for username in existing if username not in payloads]
+        if missing:
+            users = (
+                User.objects.filter(username__in=missing)
+                .select_related("profile")
+                .prefetch_related("resume_set__skills")
+            )
+            fetched = profile_payloads(users, request)
+            cache.set_many(
+                {keys[username]: payload for username, payload in fetched.items()},
+                settings.HTTP_CACHE_TIMEOUT,
+            )
+            payloads.update(fetched)
 
         return Response(
             {
-                "user": UserSerializer(user).data,
-                "profile": (
-                    ProfileSerializer(profile, context={"request": request}).data
-                    if profile
-                    else {}
-                ),
-                "resumes": ResumeSerializer(resumes, many=True).data,
+                "results": [
+                    (
+                        {"username": username, **payloads[username]}
+                        if username in payloads
+                        else {"username": username, "error": "User not found."}
+                    )
+                    for username in usernames
+                ]
             },
             status=status.HTTP_200_OK,
         )
@@ -267,8 +379,15 @@ class UpdateProfileView(APIView):
         profile.bio = request.data.get("bio", profile.bio)
         profile.country = request.data.get("country", profile.country)
         profile.governorate = request.data.get("governorate", profile.governorate)
+        locations = get_location_index()
+        profile.country_ref_id = locations.resolve_country(profile.country)
+        profile.governorate_ref_id = locations.resolve_governorate(
+            profile.country_ref_id, profile.governorate
+        )
 
         if "profile_picture" in request.FILES:
+            import imghdr
+
             image_file = request.FILES["profile_picture"]
             image_type = imghdr.what(image_file)
 
@@ -370,7 +489,7 @@ class PasswordResetConfirmView(APIView):
                 {"error": "Password is required."}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        user.set_password(new_password)
+        hashing.set_password(user, new_password)
         user.save()
         update_session_auth_hash(request, user)
         return JsonResponse(
@@ -408,6 +527,7 @@ class ResumeUploadView(APIView):
 
         resume = Resume(user=user, title=title, file=file)
         resume.save()
+        fingerprint_resume.delay(resume.id)
 
         return Response(
             {"message": "Resume uploaded successfully."},
@@ -446,10 +566,18 @@ class ResumeViewPDF(APIView):
         expected_suffix = f"{user.username}_resume.pdf"
         if not resume.file.name.endswith(expected_suffix):
             pass
-        try:
-            return FileResponse(
-                open(resume.file.path, "rb"), content_type="application/pdf"
+        if is_remote(resume.file.storage):
+            return HttpResponseRedirect(
+                resume.file.storage.url(
+                    resume.file.name,
+                    parameters={
+                        "ResponseContentType": "application/pdf",
+                        "ResponseContentDisposition": "inline",
+                    },
+                )
             )
+        try:
+            return FileResponse(resume.file.open("rb"), content_type="application/pdf")
         except FileNotFoundError:
             raise Http404("Resume file not found.")
 
@@ -467,15 +595,140 @@ class ResumeDownloadView(APIView):
         if not resume.file.name.lower().endswith(".pdf"):
             raise Http404("Resume is not a PDF file.")
 
+        disposition = f'attachment; filename="{user.username}_resume.pdf"'
+
+        # Object storage serves the bytes itself through a short-lived URL
+        if is_remote(resume.file.storage):
+            return HttpResponseRedirect(
+                resume.file.storage.url(
+                    resume.file.name,
+                    parameters={
+                        "ResponseContentType": "application/pdf",
+                        "ResponseContentDisposition": disposition,
+                    },
+                )
+            )
+
         try:
             # Open the file and create a FileResponse
             response = FileResponse(
-                open(resume.file.path, "rb"), content_type="application/pdf"
+                resume.file.open("rb"), content_type="application/pdf"
             )
             # Set Content-Disposition header to force download with a specific filename
-            response["Content-Disposition"] = (
-                f'attachment; filename="{user.username}_resume.pdf"'
-            )
+            response["Content-Disposition"] = disposition
             return response
         except FileNotFoundError:
             raise Http404("Resume file not found.")
+
+
+class ProfilePictureView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request, username, *args, **kwargs):
+        profile = get_object_or_404(
+            Profile.objects.only("profile_picture"), user__username=username
+        )
+        if not profile.profile_picture:
+            raise Http404("Profile picture not set.")
+        if is_remote(profile.profile_picture.storage):
+            return HttpResponseRedirect(profile.profile_picture.url)
+        try:
+            return FileResponse(profile.profile_picture.open("rb"))
+        except FileNotFoundError:
+            raise Http404("Profile picture file not found.")
+
+
+class ResumeExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        usernames = request.data.get("usernames")
+        max_files = settings.RESUME_EXPORT_MAX_FILES
+        if (
+            not isinstance(usernames, list)
+            or not usernames
+            or len(usernames) > max_files
+        ):
+            return Response(
+                {"error": f"Provide a list of 1 to {max_files} usernames."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        resumes = (
+            Resume.objects.filter(user__username__in=set(map(str, usernames)))
+            .select_related("user")
+            .only("file", "created_at", "user__username")
+            .order_by("user__username")
+        )
+        entries = (
+            (
+                f"{resume.user.username}_resume.{resume.file.name.rsplit('.', 1)[-1]}",
+                resume.file,
+                resume.created_at,
+            )
+            for resume in resumes.iterator()
+        )
+        response = StreamingHttpResponse(
+            stream_zip(entries), content_type="application/zip"
+        )
+        response["Content-Disposition"] = 'attachment; filename="resumes.zip"'
+        return response
+
+
+class LocationAutocompleteView(APIView):
+    permission_classes = [AllowAny]
+    renderer_classes = [ORJSONRenderer]
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "")
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 50)
+        except ValueError:
+            limit = 10
+        results = get_location_index().search(
+            query, country=request.query_params.get("country"), limit=limit
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+class SkillAutocompleteView(APIView):
+    permission_classes = [AllowAny]
+    renderer_classes = [ORJSONRenderer]
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "")
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 50)
+        except ValueError:
+            limit = 10
+        results = get_skill_index().search(query, limit=limit)
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+class SkillCanonicalizeView(APIView):
+    permission_classes = [AllowAny]
+    renderer_classes = [ORJSONRenderer]
+
+    def post(self, request, *args, **kwargs):
+        names = request.data.get("names")
+        if (
+            not isinstance(names, list)
+            or len(names) > 200
+            or not all(isinstance(name, str) for name in names)
+        ):
+            return Response(
+                {"error": "Provide a list of at most 200 skill names."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        index = get_skill_index()
+        return Response(
+            {"results": {name: index.canonicalize(name) for name in names}},
+            status=status.HTTP_200_OK,
+        )
+
+
+class AdmissionStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(admission_stats(), status=status.HTTP_200_OK)
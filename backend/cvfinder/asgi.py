@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cvfinder.settings")
 
 application = get_asgi_application()
+
+# Load reference data indexes before the first request so autocomplete
+# lookups never wait on the database.
+from api.locations import warm_location_index  # noqa: E402
+
+warm_location_index()
@@ -3,8 +3,15 @@
 from __future__ import absolute_import, unicode_literals
 
 import os
+import time
 
 from celery import Celery
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+)
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cvfinder.settings")
@@ -17,3 +24,56 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
+
+
+# Task telemetry: enqueue-to-start wait, runtime and failure counts per task,
+# accumulated in Redis so every worker and producer contributes to one view.
+
+TASK_STATS_KEY = "celery:task_stats:{task}"
+
+_started_at = {}
+
+
+def record_task_stats(task_name, **counters):
+    from django_redis import get_redis_connection
+
+    pipe = get_redis_connection("default").pipeline(transaction=False)
+    key = TASK_STATS_KEY.format(task=task_name)
+    for field, amount in counters.items():
+        pipe.hincrby(key, field, int(amount))
+    pipe.execute()
+
+
+@before_task_publish.connect
+def stamp_enqueue_time(headers=None, **kwargs):
+    if headers is not None:
+        headers["enqueued_at"] = time.time()
+
+
+@task_prerun.connect
+def record_task_start(task_id=None, task=None, **kwargs):
+    now = time.time()
+    _started_at[task_id] = now
+    enqueued_at = getattr(task.request, "enqueued_at", None) or (
+        task.request.headers or {}
+    ).get("enqueued_at")
+    if enqueued_at:
+        record_task_stats(
+            task.name, started=1, wait_ms=max(0, (now - enqueued_at) * 1000)
+        )
+    else:
+        record_task_stats(task.name, started=1)
+
+
+@task_postrun.connect
+def record_task_runtime(task_id=None, task=None, state=None, **kwargs):
+    started_at = _started_at.pop(task_id, None)
+    if started_at is not None:
+        record_task_stats(
+            task.name, finished=1, runtime_ms=(time.time() - started_at) * 1000
+        )
+
+
+@task_failure.connect
+def record_task_failure(sender=None, **kwargs):
+    record_task_stats(sender.name, failed=1)
@@ -14,6 +14,7 @@ import os
 from pathlib import Path
 
 import environ
+from kombu import Queue
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -73,6 +74,7 @@ REST_FRAMEWORK = {
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "api.middleware.AdmissionControlMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -80,8 +82,46 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.middleware.ProfilingMiddleware",
 ]
 
+# On-demand profiling: seconds between stack samples, and profile every
+# Nth request continuously (0 disables continuous profiling).
+PROFILING_INTERVAL = 0.005
+PROFILING_SAMPLE_EVERY = env.int("PROFILING_SAMPLE_EVERY", default=0)
+
+# Per-process concurrency budgets by endpoint class. Requests beyond
+# limit + queue, or waiting longer than timeout seconds, get a fast 503 so
+# cheap reads are not stuck behind hashing, file streaming or uploads.
+# Only meaningful with threaded workers (gunicorn gthread, ASGI).
+ADMISSION_CONTROL = {
+    "classes": {
+        "auth": {"limit": 4, "queue": 16, "timeout": 2.0},
+        "files": {"limit": 8, "queue": 16, "timeout": 1.0},
+        "uploads": {"limit": 4, "queue": 8, "timeout": 1.0},
+        "reads": {"limit": 32, "queue": 64, "timeout": 0.5},
+    },
+    "routes": {
+        "signup": "auth",
+        "verify-email": "auth",
+        "login": "auth",
+        "password_reset_confirm": "auth",
+        "resume-view-pdf": "files",
+        "resume-download": "files",
+        "resume-export": "files",
+        "profile-picture": "files",
+        "resume-upload": "uploads",
+        "update-profile": "uploads",
+        "user-profile": "reads",
+        "public-profile": "reads",
+        "profile-batch": "reads",
+        "location-autocomplete": "reads",
+        "skill-autocomplete": "reads",
+        "skill-canonicalize": "reads",
+    },
+    "retry_after": 1,
+}
+
 ROOT_URLCONF = "cvfinder.urls"
 
 TEMPLATES = [
@@ -110,6 +150,25 @@ CORS_ALLOW_ALL_ORIGINS = True
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
+PASSWORD_HASHERS = [
+    "api.hashers.TunedArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Argon2id costs (OWASP minimum: 19 MiB, 2 iterations, 1 lane). Existing
+# PBKDF2 hashes are rehashed with these parameters on the next login.
+PASSWORD_ARGON2_TIME_COST = env.int("PASSWORD_ARGON2_TIME_COST", default=2)
+PASSWORD_ARGON2_MEMORY_COST = env.int("PASSWORD_ARGON2_MEMORY_COST", default=19456)
+
+# Password hashing runs on a bounded thread pool (argon2-cffi releases the
+# GIL). Requests beyond workers + queue get a 429 instead of piling up.
+PASSWORD_HASHING_WORKERS = env.int("PASSWORD_HASHING_WORKERS", default=2)
+PASSWORD_HASHING_MAX_QUEUE = env.int("PASSWORD_HASHING_MAX_QUEUE", default=8)
+PASSWORD_HASHING_RETRY_AFTER = 1
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -157,11 +216,69 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# S3-compatible object storage for media (AWS, MinIO, ...). When a bucket is
+# configured, uploads stream to it in multipart chunks and file endpoints
+# redirect to short-lived presigned URLs instead of serving bytes.
+AWS_STORAGE_BUCKET_NAME = env("AWS_STORAGE_BUCKET_NAME", default="")
+AWS_QUERYSTRING_EXPIRE = env.int("AWS_QUERYSTRING_EXPIRE", default=3600)
+if AWS_STORAGE_BUCKET_NAME:
+    from boto3.s3.transfer import TransferConfig
+
+    AWS_S3_ENDPOINT_URL = env("AWS_S3_ENDPOINT_URL", default=None)
+    AWS_S3_REGION_NAME = env("AWS_S3_REGION_NAME", default=None)
+    AWS_ACCESS_KEY_ID = env("AWS_ACCESS_KEY_ID", default=None)
+    AWS_SECRET_ACCESS_KEY = env("AWS_SECRET_ACCESS_KEY", default=None)
+    AWS_QUERYSTRING_AUTH = True
+    AWS_DEFAULT_ACL = None
+    AWS_S3_FILE_OVERWRITE = False
+    AWS_S3_TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=8 * 1024 * 1024,
+        max_concurrency=4,
+    )
+    STORAGES = {
+        "default": {"BACKEND": "storages.backends.s3.S3Storage"},
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+
 
 CELERY_BROKER_URL = "redis://redis:6379/0"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
+# Interactive mail never waits behind document processing or maintenance;
+# each queue is consumed by its own worker (see docker-compose.yml) so
+# concurrency and prefetch can be tuned per workload. Unrouted tasks land
+# on the maintenance queue, so user-facing tasks must be routed explicitly.
+CELERY_TASK_QUEUES = (
+    Queue("mail"),
+    Queue("documents"),
+    Queue("maintenance"),
+)
+CELERY_TASK_DEFAULT_QUEUE = "maintenance"
+CELERY_TASK_ROUTES = {
+    "api.tasks.send_verification_email": {"queue": "mail"},
+    "api.tasks.fingerprint_resume": {"queue": "documents"},
+    "api.tasks.reextract_resumes": {"queue": "documents"},
+    "api.tasks.tag_resume_skills": {"queue": "documents"},
+    "api.tasks.purge_*": {"queue": "maintenance"},
+}
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_BEAT_SCHEDULE = {
+    "purge-unverified-accounts": {
+        "task": "api.tasks.purge_unverified_accounts",
+        "schedule": 3600.0,
+    },
+}
+
+# Inactive accounts whose verification code was sent longer ago than this
+# are deleted by the hourly purge task.
+UNVERIFIED_ACCOUNT_MAX_AGE_HOURS = env.int(
+    "UNVERIFIED_ACCOUNT_MAX_AGE_HOURS", default=48
+)
+
 AUTH_USER_MODEL = "api.CustomUser"
 
 CACHES = {
@@ -173,3 +290,23 @@ CACHES = {
         },
     }
 }
+
+# Near-duplicate resume detection: estimated Jaccard similarity of resume
+# text above which an upload is flagged as a copy of an earlier one.
+RESUME_DUPLICATE_THRESHOLD = 0.8
+
+# Seconds a rendered, precompressed profile response stays in the cache.
+# Entries are keyed by resource version, so this only bounds memory use.
+HTTP_CACHE_TIMEOUT = 300
+
+# Maximum number of usernames accepted by /api/profiles/batch/.
+PROFILE_BATCH_MAX = 100
+
+# Admin changelists: tables with more estimated rows than this show the
+# pg_class estimate instead of running COUNT(*). Bulk admin actions enqueue
+# Celery tasks with this many ids each.
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 10000
+ADMIN_TASK_BATCH_SIZE = 500
+
+# Maximum number of resumes bundled into one streamed ZIP export.
+RESUME_EXPORT_MAX_FILES = 200
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cvfinder.settings")
 
 application = get_wsgi_application()
+
+# Load reference data indexes before the first request so autocomplete
+# lookups never wait on the database.
+from api.locations import warm_location_index  # noqa: E402
+
+warm_location_index()